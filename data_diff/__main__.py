@@ -75,6 +75,15 @@ def _get_schema(pair: Tuple[Database, DbPath]) -> Dict[str, RawColumnInfo]:
     return db.query_table_schema(table_path)
 
 
+def _get_schemas(
+    dbs: Tuple[Database, Database], table_paths: List[DbPath], differ: TableDiffer
+) -> List[Dict[str, RawColumnInfo]]:
+    db1, db2 = dbs
+    if db1 is db2 and db1.SUPPORTS_BATCHED_TABLE_SCHEMAS:
+        return db1.query_table_schemas(table_paths)
+    return list(differ._thread_map(_get_schema, safezip(dbs, table_paths)))
+
+
 def diff_schemas(table1, table2, schema1, schema2, columns) -> None:
     logging.info("Diffing schemas...")
     attrs = "name", "type", "datetime_precision", "numeric_precision", "numeric_scale"
@@ -568,7 +577,7 @@ def _data_diff(
         table_names = table1, table2
         table_paths = [db.dialect.parse_table_name(t) for db, t in safezip(dbs, table_names)]
 
-        schemas = list(differ._thread_map(_get_schema, safezip(dbs, table_paths)))
+        schemas = _get_schemas(dbs, table_paths, differ)
         schema1, schema2 = schemas = [
             create_schema(db.name, table_path, schema, case_sensitive)
             for db, table_path, schema in safezip(dbs, table_paths, schemas)
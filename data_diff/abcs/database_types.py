@@ -106,6 +106,12 @@ class ColType:
     _notes: List[N] = attrs.field(factory=list, init=False, hash=False, eq=False)
 
     def add_note(self, note: N) -> None:
+        """Attach a note to this instance.
+
+        Note that dialects may share the same instance between columns of the same type
+        (e.g. Athena caches parsed types by their type string), so a note is seen by all of them.
+        Only add notes to instances that were created for a single column.
+        """
         self._notes.append(note)
 
     def get_note(self, cls: Type[N]) -> Optional[N]:
@@ -281,13 +287,13 @@ class Array(ColType):
 
 
 # Unlike JSON, structs are not free-form and have a very specific set of fields and their types.
-# We do not parse & use those fields now, but we can do this later.
+# Not all databases parse those fields yet (``fields`` is then left empty), but we can do this later.
 # For example, in BigQuery:
 # - https://cloud.google.com/bigquery/docs/reference/standard-sql/data-types#struct_type
 # - https://cloud.google.com/bigquery/docs/reference/standard-sql/lexical#struct_literals
 @attrs.define(frozen=True)
 class Struct(ColType):
-    pass
+    fields: Tuple[Tuple[str, ColType], ...] = ()
 
 
 @attrs.define(frozen=True)
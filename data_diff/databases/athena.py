@@ -1,11 +1,13 @@
-from functools import partial
+from datetime import timedelta
+from functools import lru_cache, partial
+import logging
 import re
-from typing import Any, ClassVar, Type
+from typing import Any, ClassVar, Dict, Iterator, List, Optional, Sequence, Tuple, Type
 
 import attrs
 
 from data_diff.schema import RawColumnInfo
-from data_diff.utils import match_regexps
+from data_diff.utils import sql_leading_keyword
 
 from data_diff.abcs.database_types import (
     Timestamp,
@@ -24,6 +26,7 @@ from data_diff.abcs.database_types import (
     JSON,
     Array,
     Struct,
+    UnknownColType,
 )
 from data_diff.databases.base import (
     BaseDialect,
@@ -37,17 +40,113 @@ from data_diff.databases.base import (
     CHECKSUM_OFFSET,
     TIMESTAMP_PRECISION_POS,
 )
+from data_diff.databases.presto import FETCHALL_KEYWORDS, FETCHONE_KEYWORDS
 
+logger = logging.getLogger("athena")
 
-def query_cursor(c, sql_code):
-    c.execute(sql_code)
-    if sql_code.lower().startswith("select"):
+_MD5_SUBSTR_START = 1 + MD5_HEXDIGITS - CHECKSUM_HEXDIGITS
+_MD5_AS_INT_PREFIX = "cast(from_base(substr(to_hex(md5(to_utf8("
+_MD5_AS_INT_SUFFIX = f"))), {_MD5_SUBSTR_START}), 16) as decimal(38, 0)) - {CHECKSUM_OFFSET}"
+
+_SELECT_TABLE_SCHEMAS = (
+    "SELECT table_schema, table_name, "
+    "column_name, data_type, 3 as datetime_precision, 3 as numeric_precision, NULL as numeric_scale "
+    "FROM INFORMATION_SCHEMA.COLUMNS "
+)
+
+_SELECT_TABLE_SCHEMA = (
+    "SELECT column_name, data_type, 3 as datetime_precision, 3 as numeric_precision, NULL as numeric_scale "
+    "FROM INFORMATION_SCHEMA.COLUMNS "
+    "WHERE table_name = %(table)s AND table_schema = %(schema)s"
+)
+
+# Types that carry no per-column state are shared between all the columns that have them.
+# Like every type cached in Dialect._parsed_types, they must not be modified (e.g. with add_note()).
+_TEXT = Text()
+_INTEGER = Integer()
+_BOOLEAN = Boolean()
+_JSON = JSON()
+_SHARED_TYPES = {
+    "integer": _INTEGER,
+    "bigint": _INTEGER,
+    "varchar": _TEXT,
+    "string": _TEXT,
+    "boolean": _BOOLEAN,
+    "json": _JSON,
+}
+
+_TIMESTAMP_RE = re.compile(r"timestamp\((?P<precision>\d)\)(?P<tz> with time zone)?")
+_DECIMAL_RE = re.compile(r"decimal\((\d+),(\d+)\)")
+_ARRAY_RE = re.compile(r"array\((.+)\)")
+_STRUCT_RE = re.compile(r"struct<(.+)>")
+_STRING_RE = re.compile(r"(?:var)?char\((\d+)\)")
+
+
+def query_cursor(c, sql_code, params=None):
+    c.execute(sql_code, params)
+    keyword = sql_leading_keyword(sql_code)
+    if keyword in FETCHALL_KEYWORDS:
+        as_pandas = getattr(c, "as_pandas", None)
+        if as_pandas is not None:
+            # PandasCursor: the result was read in one go from the CSV file in S3.
+            # Convert back to the row tuples the rest of data-diff expects, with None for NULLs.
+            df = as_pandas()
+            df = df.astype(object).where(df.notna(), None)
+            return list(df.itertuples(index=False, name=None))
         return c.fetchall()
     # Required for the query to actually run 🤯
-    if re.match(r"(insert|create|truncate|drop|explain)", sql_code, re.IGNORECASE):
+    if keyword in FETCHONE_KEYWORDS:
         return c.fetchone()
 
 
+# Whether values of a column type need normalizing to be comparable, by the exact type.
+# Subclasses are resolved with isinstance() on first sight.
+_COMPLEX_TYPES: Dict[type, bool] = {JSON: True, Array: True, Struct: True}
+
+
+def _is_complex_type(t: type) -> bool:
+    try:
+        return _COMPLEX_TYPES[t]
+    except KeyError:
+        is_complex = _COMPLEX_TYPES[t] = issubclass(t, (JSON, Array, Struct))
+        return is_complex
+
+
+def _as_bool(value: Any) -> bool:
+    "Options may come from the URI as strings"
+    if isinstance(value, str):
+        return value.lower() in ("1", "true", "yes")
+    return bool(value)
+
+
+def _split_struct_fields(fields: str) -> Iterator[str]:
+    "Split the inside of struct<...> on its top-level commas, leaving nested types intact"
+    depth = 0
+    start = 0
+    for i, ch in enumerate(fields):
+        if ch in "<(":
+            depth += 1
+        elif ch in ">)":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            yield fields[start:i]
+            start = i + 1
+    yield fields[start:]
+
+
+# Segment boundaries are reused across many queries, so their literals are worth caching.
+# Aware datetimes compare equal across offsets (12:00+00:00 == 13:00+01:00), so the offset is part of the key.
+@lru_cache(maxsize=4096)
+def _timestamp_literal(t: DbTime, _utcoffset: Optional[timedelta]) -> str:
+    return f"timestamp '{t.isoformat(' ')}'"
+
+
+@lru_cache(maxsize=16)
+def _timestamp_pads(precision: int) -> Tuple[int, int]:
+    "Lengths to pad a formatted timestamp to: first with '.', then with '0'"
+    return TIMESTAMP_PRECISION_POS + precision, TIMESTAMP_PRECISION_POS + 6
+
+
 @import_helper("athena")
 def import_athena():
     import pyathena
@@ -55,6 +154,14 @@ def import_athena():
     return pyathena
 
 
+@import_helper(text="You can install it using 'pip install pyathena[pandas]'")
+def import_athena_pandas_cursor():
+    from pyathena.pandas.cursor import PandasCursor
+
+    return PandasCursor
+
+
+@attrs.define(frozen=False)
 class Dialect(BaseDialect):
     name = "Athena"
     ROUNDS_ON_PREC_LOSS = True
@@ -80,6 +187,10 @@ class Dialect(BaseDialect):
         "struct": Struct,
     }
 
+    # Parsed column types, by their type string. The instances are shared between columns and tables,
+    # so they must not be modified (see ColType.add_note).
+    _parsed_types: Dict[str, ColType] = attrs.field(factory=dict, init=False, repr=False, eq=False)
+
     def explain_as_text(self, query: str) -> str:
         return f"EXPLAIN (FORMAT TEXT) {query}"
 
@@ -93,7 +204,7 @@ class Dialect(BaseDialect):
             return super().type_repr(t)
 
     def timestamp_value(self, t: DbTime) -> str:
-        return f"timestamp '{t.isoformat(' ')}'"
+        return _timestamp_literal(t, t.utcoffset())
 
     def quote(self, s: str):
         return f'"{s}"'
@@ -103,42 +214,63 @@ class Dialect(BaseDialect):
 
     def to_comparable(self, value: str, coltype: ColType) -> str:
         """Ensure that the expression is comparable in ``IS DISTINCT FROM``."""
-        if isinstance(coltype, (JSON, Array, Struct)):
+        if _is_complex_type(type(coltype)):
             return self.normalize_value_by_type(value, coltype)
         else:
             return super().to_comparable(value, coltype)
 
     def parse_type(self, table_path: DbPath, info: RawColumnInfo) -> ColType:
-        timestamp_regexps = {
-            r"timestamp\((\d)\)": Timestamp,
-            r"timestamp\((\d)\) with time zone": TimestampTZ,
-        }
-        for m, t_cls in match_regexps(timestamp_regexps, info.data_type):
-            precision = int(m.group(1))
-            return t_cls(precision=precision, rounds=self.ROUNDS_ON_PREC_LOSS)
-
-        number_regexps = {r"decimal\((\d+),(\d+)\)": Decimal}
-        for m, n_cls in match_regexps(number_regexps, info.data_type):
-            _prec, scale = map(int, m.groups())
-            return n_cls(scale)
-
-        array_regexps = {r"array\((.+)\)": Array}
-        for m, n_cls in match_regexps(array_regexps, info.data_type):
-            item_info = attrs.evolve(info, data_type=m.group(1))
-            item_type = self.parse_type(table_path, item_info)
-            col_type = Array(item_type=item_type)
-            return col_type
-
-        struct_regexps = {r"struct<(.+)>": Struct}
-        for m, n_cls in match_regexps(struct_regexps, info.data_type):
-            fields = [f.split(":") for f in m.group(1).split(",")]
-            col_type = Struct(fields=fields)
+        return self._parse_type_str(table_path, info.data_type, info)
+
+    def _parse_type_str(self, table_path: DbPath, data_type: str, info: RawColumnInfo) -> ColType:
+        """Parse the type string ``data_type``, which is either the type of the column ``info``,
+        or a type nested in it (array items, struct fields).
+        """
+        # Athena reports the same precision and scale for every column (see Athena.select_table_schema),
+        # so the parsed type depends only on the type string.
+        try:
+            return self._parsed_types[data_type]
+        except KeyError:
+            col_type = self._parsed_types[data_type] = self._parse_uncached_type_str(table_path, data_type, info)
             return col_type
 
-        string_regexps = {r"varchar\((\d+)\)": Text, r"char\((\d+)\)": Text}
-        for m, n_cls in match_regexps(string_regexps, info.data_type):
-            return n_cls()
+    def _parse_uncached_type_str(self, table_path: DbPath, data_type: str, info: RawColumnInfo) -> ColType:
+        m = _TIMESTAMP_RE.fullmatch(data_type)
+        if m:
+            t_cls = TimestampTZ if m.group("tz") else Timestamp
+            return t_cls(precision=int(m.group("precision")), rounds=self.ROUNDS_ON_PREC_LOSS)
 
+        m = _DECIMAL_RE.fullmatch(data_type)
+        if m:
+            _prec, scale = map(int, m.groups())
+            return Decimal(scale)
+
+        m = _ARRAY_RE.fullmatch(data_type)
+        if m:
+            item_type = self._parse_type_str(table_path, m.group(1), info)
+            return Array(item_type=item_type)
+
+        m = _STRUCT_RE.fullmatch(data_type)
+        if m:
+            fields = []
+            for field in _split_struct_fields(m.group(1)):
+                name, sep, field_type = field.partition(":")
+                if not sep:
+                    # Not a "name:type" field list that we know how to read
+                    return UnknownColType(data_type)
+                fields.append((name.strip(), self._parse_type_str(table_path, field_type.strip(), info)))
+            return Struct(fields=tuple(fields))
+
+        if _STRING_RE.fullmatch(data_type):
+            return _TEXT
+
+        shared_type = _SHARED_TYPES.get(data_type)
+        if shared_type is not None:
+            return shared_type
+
+        if data_type != info.data_type:
+            # A nested type that is resolved via TYPE_CLASSES. Happens once per distinct type, thanks to the cache.
+            info = attrs.evolve(info, data_type=data_type)
         return super().parse_type(table_path, info)
 
     def set_timezone_to_utc(self) -> str:
@@ -148,7 +280,7 @@ class Dialect(BaseDialect):
         return "current_timestamp"
 
     def md5_as_int(self, s: str) -> str:
-        return f"cast(from_base(substr(to_hex(md5(to_utf8({s}))), {1+MD5_HEXDIGITS-CHECKSUM_HEXDIGITS}), 16) as decimal(38, 0)) - {CHECKSUM_OFFSET}"
+        return f"{_MD5_AS_INT_PREFIX}{s}{_MD5_AS_INT_SUFFIX}"
 
     def md5_as_hex(self, s: str) -> str:
         return f"to_hex(md5(to_utf8({s})))"
@@ -159,18 +291,15 @@ class Dialect(BaseDialect):
 
     def normalize_timestamp(self, value: str, coltype: TemporalType) -> str:
         # TODO rounds
-        if coltype.rounds:
-            s = f"date_format(cast({value} as timestamp(6)), '%Y-%m-%d %H:%i:%S.%f')"
-        else:
-            s = f"date_format(cast({value} as timestamp(6)), '%Y-%m-%d %H:%i:%S.%f')"
-
-        return f"RPAD(RPAD({s}, {TIMESTAMP_PRECISION_POS+coltype.precision}, '.'), {TIMESTAMP_PRECISION_POS+6}, '0')"
+        s = f"date_format(cast({value} as timestamp(6)), '%Y-%m-%d %H:%i:%S.%f')"
+        p1, p2 = _timestamp_pads(coltype.precision)
+        return f"RPAD(RPAD({s}, {p1}, '.'), {p2}, '0')"
 
     def normalize_number(self, value: str, coltype: FractionalType) -> str:
         return self.to_string(f"cast({value} as decimal(38,{coltype.precision}))")
 
     def normalize_boolean(self, value: str, _coltype: Boolean) -> str:
-        return self.to_string(f"cast ({value} as int)")
+        return f"cast(cast ({value} as int) as varchar)"
 
     def normalize_json(self, value: str, _coltype: JSON) -> str:
         return f"json_format(cast({value} as json))"
@@ -186,38 +315,70 @@ class Dialect(BaseDialect):
 class Athena(Database):
     DIALECT_CLASS: ClassVar[Type[BaseDialect]] = Dialect
     CONNECT_URI_HELP = "pyathena://<project>/<dataset>"
+    SUPPORTS_BATCHED_TABLE_SCHEMAS = True
     CONNECT_URI_PARAMS = ["aws_profile_name", "s3_staging_dir", "region_name", "work_group"]
 
     _conn: Any
 
     def __init__(self, **kw) -> None:
-        super().__init__()
-        self.default_schema = "public"
+        super().__init__(default_schema=kw.get("schema") or "public")
         athenadb = import_athena()
 
-        if kw.get("schema"):
-            self.default_schema = kw.get("schema")
-
         aws_profile_name = kw.get("aws_profile_name")
         s3_staging_dir = kw.get("s3_staging_dir")
         region_name = kw.get("region_name")
         work_group = kw.get("work_group")
 
+        connect_kw = {}
+        cursor_class = kw.get("cursor_class")
+        if cursor_class:
+            if not isinstance(cursor_class, type):
+                # e.g. `?cursor_class=...` in the URI, which can only be a string
+                raise TypeError(
+                    f"{self.name}: cursor_class must be a PyAthena cursor class, got {cursor_class!r}. "
+                    "Use `use_pandas_cursor=true` in the URI."
+                )
+            connect_kw["cursor_class"] = cursor_class
+        elif _as_bool(kw.get("use_pandas_cursor")):
+            # Reads SELECT results straight from the result CSV in S3, instead of paging through GetQueryResults
+            try:
+                connect_kw["cursor_class"] = import_athena_pandas_cursor()
+            except ModuleNotFoundError as e:
+                logger.warning(f"Cannot use PyAthena's PandasCursor, falling back to the default cursor: {e}")
+
+        # Query result reuse lets Athena answer repeated identical queries (e.g. checksums over
+        # unchanged segments) from cached results, without scanning S3 again.
+        # Requires Athena engine v3 and PyAthena >= 2.18. Given in the URI as `?result_reuse_enable=true`.
+        if _as_bool(kw.get("result_reuse_enable")):
+            connect_kw["result_reuse_enable"] = True
+            result_reuse_minutes = kw.get("result_reuse_minutes")
+            connect_kw["result_reuse_minutes"] = int(result_reuse_minutes) if result_reuse_minutes else 60
+
         self._conn = athenadb.connect(
             profile_name=aws_profile_name,
             s3_staging_dir=s3_staging_dir,
             region_name=region_name,
             work_group=work_group,
+            **connect_kw,
         )
 
-    def _query(self, sql_code: str) -> list:
+    def _query(self, sql_code: str, params: Optional[Dict[str, Any]] = None) -> list:
         "Uses the standard SQL cursor interface"
         c = self._conn.cursor()
 
         if isinstance(sql_code, ThreadLocalInterpreter):
             return sql_code.apply_queries(partial(query_cursor, c))
 
-        return query_cursor(c, sql_code)
+        return query_cursor(c, sql_code, params)
+
+    def get_df(self, sql_code: str):
+        """Run the query and return its result as a pandas DataFrame.
+
+        Requires the connection to be created with ``cursor_class=pyathena.pandas.cursor.PandasCursor``.
+        """
+        c = self._conn.cursor()
+        c.execute(sql_code)
+        return c.as_pandas()
 
     def _normalize_table_path(self, path: DbPath) -> DbPath:
         if len(path) == 1:
@@ -242,6 +403,51 @@ class Athena(Database):
             f"WHERE table_name = '{table}' AND table_schema = '{schema}'"
         )
 
+    def _select_table_schema_params(self, path: DbPath) -> Tuple[str, Dict[str, str]]:
+        """Like select_table_schema(), but with the table and schema names as parameters.
+
+        PyAthena substitutes them on the client, escaping quotes in the names.
+        """
+        schema, table = self._normalize_table_path(path)
+        return _SELECT_TABLE_SCHEMA, {"table": table, "schema": schema}
+
+    def query_table_schema(self, path: DbPath) -> Dict[str, RawColumnInfo]:
+        sql_code, params = self._select_table_schema_params(path)
+        logger.debug("Running SQL (%s): %s \n%s %s", self.name, path, sql_code, params)
+        rows = self._query(sql_code, params)
+        return self._rows_to_raw_schema(path, rows)
+
+    def select_table_schemas(self, paths: Sequence[DbPath]) -> Tuple[str, Dict[str, str]]:
+        """Provide SQL for selecting the schemas of all the given tables at once, and its parameters.
+
+        The rows are prefixed with (table_schema, table_name). Athena's information_schema only pushes down
+        filters on single columns, so the schemas and names are filtered separately, rather than as pairs.
+        The result may then include other combinations of them, which query_table_schemas() ignores.
+        """
+        params = {}
+        for i, path in enumerate(paths):
+            schema, table = self._normalize_table_path(path)
+            params[f"schema{i}"] = schema
+            params[f"table{i}"] = table
+
+        schemas = ", ".join(f"%(schema{i})s" for i in range(len(paths)))
+        tables = ", ".join(f"%(table{i})s" for i in range(len(paths)))
+        return f"{_SELECT_TABLE_SCHEMAS}WHERE table_schema IN ({schemas}) AND table_name IN ({tables})", params
+
+    def query_table_schemas(self, paths: Sequence[DbPath]) -> List[Dict[str, RawColumnInfo]]:
+        "Query the schemas of several tables in a single round-trip to Athena"
+        sql_code, params = self.select_table_schemas(paths)
+        logger.debug("Running SQL (%s): %s \n%s %s", self.name, paths, sql_code, params)
+
+        rows_by_table = {}
+        for table_schema, table_name, *row in self._query(sql_code, params):
+            rows_by_table.setdefault((table_schema, table_name), []).append(row)
+
+        return [
+            self._rows_to_raw_schema(path, rows_by_table.get(tuple(self._normalize_table_path(path)), []))
+            for path in paths
+        ]
+
     @property
     def is_autocommit(self) -> bool:
         return False
@@ -35,7 +35,7 @@ from typing_extensions import Self
 from data_diff.abcs.compiler import AbstractCompiler, Compilable
 from data_diff.queries.extras import ApplyFuncAndNormalizeAsString, Checksum, NormalizeAsString
 from data_diff.schema import RawColumnInfo
-from data_diff.utils import ArithString, ArithUUID, is_uuid, join_iter, safezip
+from data_diff.utils import ArithString, ArithUUID, is_uuid, join_iter, safezip, sql_leading_keyword
 from data_diff.queries.api import Expr, table, Select, SKIP, Explain, Code, this
 from data_diff.queries.ast_classes import (
     Alias,
@@ -95,6 +95,9 @@ from data_diff.abcs.database_types import (
 logger = logging.getLogger("database")
 cv_params = contextvars.ContextVar("params")
 
+# Statements whose rows are fetched by Database._query_cursor()
+_ROW_RETURNING_KEYWORDS = frozenset({"select", "explain", "show"})
+
 
 class CompileError(Exception):
     pass
@@ -931,6 +934,7 @@ class Database(abc.ABC):
 
     SUPPORTS_ALPHANUMS: ClassVar[bool] = True
     SUPPORTS_UNIQUE_CONSTAINT: ClassVar[bool] = False
+    SUPPORTS_BATCHED_TABLE_SCHEMAS: ClassVar[bool] = False  # query_table_schemas() uses a single query
     CONNECT_URI_KWPARAMS: ClassVar[List[str]] = []
 
     default_schema: Optional[str] = None
@@ -1046,7 +1050,18 @@ class Database(abc.ABC):
               accessing the schema using a SQL query.
         """
         rows = self.query(self.select_table_schema(path), list, log_message=path)
+        return self._rows_to_raw_schema(path, rows)
+
+    def query_table_schemas(self, paths: Sequence[DbPath]) -> List[Dict[str, RawColumnInfo]]:
+        """Query the schemas of several tables, and return them in the same order as 'paths'.
+
+        Databases that can fetch several schemas in a single query override this,
+        and set SUPPORTS_BATCHED_TABLE_SCHEMAS.
+        """
+        return [self.query_table_schema(path) for path in paths]
 
+    def _rows_to_raw_schema(self, path: DbPath, rows: List[Sequence[Any]]) -> Dict[str, RawColumnInfo]:
+        """Turn the rows returned by the query of select_table_schema() into {column: RawColumnInfo}"""
         if not rows:
             raise RuntimeError(f"{self.name}: Table '{'.'.join(path)}' does not exist, or has no columns")
 
@@ -1171,7 +1186,7 @@ class Database(abc.ABC):
         assert isinstance(sql_code, str), sql_code
         try:
             c.execute(sql_code)
-            if sql_code.lower().startswith(("select", "explain", "show")):
+            if sql_leading_keyword(sql_code) in _ROW_RETURNING_KEYWORDS:
                 columns = [col[0] for col in c.description]
 
                 fetched = c.fetchall()
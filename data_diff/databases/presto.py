@@ -1,11 +1,10 @@
 from functools import partial
-import re
 from typing import Any, ClassVar, Type
 
 import attrs
 
 from data_diff.schema import RawColumnInfo
-from data_diff.utils import match_regexps
+from data_diff.utils import match_regexps, sql_leading_keyword
 
 from data_diff.abcs.database_types import (
     Timestamp,
@@ -35,13 +34,19 @@ from data_diff.databases.base import (
     TIMESTAMP_PRECISION_POS,
 )
 
+# Statement classification for query_cursor(), also used by Athena:
+# rows are fetched for the first set, and a single fetch is required for the second one to actually run.
+FETCHALL_KEYWORDS = frozenset({"select"})
+FETCHONE_KEYWORDS = frozenset({"insert", "create", "truncate", "drop", "explain"})
+
 
 def query_cursor(c, sql_code):
     c.execute(sql_code)
-    if sql_code.lower().startswith("select"):
+    keyword = sql_leading_keyword(sql_code)
+    if keyword in FETCHALL_KEYWORDS:
         return c.fetchall()
     # Required for the query to actually run 🤯
-    if re.match(r"(insert|create|truncate|drop|explain)", sql_code, re.IGNORECASE):
+    if keyword in FETCHONE_KEYWORDS:
         return c.fetchone()
 
 
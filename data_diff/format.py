@@ -1,5 +1,6 @@
 import collections
 from enum import Enum
+from functools import lru_cache
 from typing import Any, Optional, List, Dict, Tuple, Type
 
 import attrs
@@ -53,16 +54,14 @@ def jsonify(
     table2 = diff_info.tables[1]
     key_columns = table1.key_columns
 
-    t1_exclusive_rows = []
-    t2_exclusive_rows = []
-    diff_rows = []
     rows = None
-    schema = [field for field, _ in diff_info.diff_schema]
+    schema = tuple(field for field, _ in diff_info.diff_schema)
+    plan = _plan_rows(schema, tuple(key_columns))
 
-    t1_exclusive_rows, t2_exclusive_rows, diff_rows = _group_rows(diff_info, schema)
+    t1_exclusive_rows, t2_exclusive_rows, diff_rows = _group_rows(diff_info.diff, plan)
 
     if not stats_only:
-        rows = _make_rows_diff(t1_exclusive_rows, t2_exclusive_rows, diff_rows, key_columns)
+        rows = _make_rows_diff(t1_exclusive_rows, t2_exclusive_rows, diff_rows, plan)
 
     summary = None
     if with_summary:
@@ -229,47 +228,90 @@ class JsonDiff:
     version: str = "1.1.0"
 
 
-def _group_rows(
-    diff_info: DiffResultWrapper, schema: List[str]
-) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+Row = Tuple[Any, ...]
+
+
+@attrs.define(frozen=True)
+class _RowsPlan:
+    """
+    Where each JSON value is found in the rows of a given diff schema.
+
+    Computed once per schema, so that jsonifying a row doesn't need to inspect the field names again.
+    """
+
+    is_exclusive_a: int
+    is_exclusive_b: int
+    # column -> (index in dataset1, index in dataset2, index of is_diff, isPK)
+    diff: Dict[str, Tuple[int, int, int, bool]]
+    # column -> (index of the value, isPK)
+    exclusive_a: Dict[str, Tuple[int, bool]]
+    exclusive_b: Dict[str, Tuple[int, bool]]
+
+
+@lru_cache(maxsize=64)
+def _plan_rows(schema: Tuple[str, ...], key_columns: Tuple[str, ...]) -> _RowsPlan:
+    diff_columns = collections.defaultdict(dict)
+    exclusive_a = {}
+    exclusive_b = {}
+    for i, field in enumerate(schema):
+        if field in ("is_exclusive_a", "is_exclusive_b"):
+            continue
+
+        if field.startswith("is_diff_"):
+            column_name = field[len("is_diff_") :]
+            diff_columns[column_name]["isDiff"] = i
+
+        elif field.endswith("_a"):
+            column_name = field[: -len("_a")]
+            diff_columns[column_name]["dataset1"] = i
+            exclusive_a[column_name] = (i, column_name in key_columns)
+
+        elif field.endswith("_b"):
+            column_name = field[: -len("_b")]
+            diff_columns[column_name]["dataset2"] = i
+            exclusive_b[column_name] = (i, column_name in key_columns)
+
+    return _RowsPlan(
+        is_exclusive_a=schema.index("is_exclusive_a"),
+        is_exclusive_b=schema.index("is_exclusive_b"),
+        diff={
+            column: (idx["dataset1"], idx["dataset2"], idx["isDiff"], column in key_columns)
+            for column, idx in diff_columns.items()
+        },
+        exclusive_a=exclusive_a,
+        exclusive_b=exclusive_b,
+    )
+
+
+def _group_rows(rows: List[Row], plan: _RowsPlan) -> Tuple[List[Row], List[Row], List[Row]]:
     t1_exclusive_rows = []
     t2_exclusive_rows = []
     diff_rows = []
 
-    for row in diff_info.diff:
-        row_w_schema = dict(zip(schema, row))
-        is_t1_exclusive = row_w_schema["is_exclusive_a"]
-        is_t2_exclusive = row_w_schema["is_exclusive_b"]
-
-        if is_t1_exclusive:
-            t1_exclusive_rows.append(row_w_schema)
+    is_exclusive_a = plan.is_exclusive_a
+    is_exclusive_b = plan.is_exclusive_b
+    for row in rows:
+        if row[is_exclusive_a]:
+            t1_exclusive_rows.append(row)
 
-        elif is_t2_exclusive:
-            t2_exclusive_rows.append(row_w_schema)
+        elif row[is_exclusive_b]:
+            t2_exclusive_rows.append(row)
 
         else:
-            diff_rows.append(row_w_schema)
+            diff_rows.append(row)
 
     return t1_exclusive_rows, t2_exclusive_rows, diff_rows
 
 
 def _make_rows_diff(
-    t1_exclusive_rows: List[Dict[str, Any]],
-    t2_exclusive_rows: List[Dict[str, Any]],
-    diff_rows: List[Dict[str, Any]],
-    key_columns: List[str],
+    t1_exclusive_rows: List[Row],
+    t2_exclusive_rows: List[Row],
+    diff_rows: List[Row],
+    plan: _RowsPlan,
 ) -> RowsDiff:
-    diff_rows_jsonified = []
-    for row in diff_rows:
-        diff_rows_jsonified.append(_jsonify_diff(row, key_columns))
-
-    t1_exclusive_rows_jsonified = []
-    for row in t1_exclusive_rows:
-        t1_exclusive_rows_jsonified.append(_jsonify_exclusive(row, key_columns))
-
-    t2_exclusive_rows_jsonified = []
-    for row in t2_exclusive_rows:
-        t2_exclusive_rows_jsonified.append(_jsonify_exclusive(row, key_columns))
+    diff_rows_jsonified = [_jsonify_diff(row, plan.diff) for row in diff_rows]
+    t1_exclusive_rows_jsonified = [_jsonify_exclusive(row, plan.exclusive_a) for row in t1_exclusive_rows]
+    t2_exclusive_rows_jsonified = [_jsonify_exclusive(row, plan.exclusive_b) for row in t2_exclusive_rows]
 
     return RowsDiff(
         exclusive=ExclusiveDiff(dataset1=t1_exclusive_rows_jsonified, dataset2=t2_exclusive_rows_jsonified),
@@ -277,45 +319,15 @@ def _make_rows_diff(
     )
 
 
-def _jsonify_diff(row: Dict[str, Any], key_columns: List[str]) -> Dict[str, JsonDiffRowValue]:
-    columns = collections.defaultdict(dict)
-    for field, value in row.items():
-        if field in ("is_exclusive_a", "is_exclusive_b"):
-            continue
-
-        if field.startswith("is_diff_"):
-            column_name = field[len("is_diff_") :]
-            columns[column_name]["isDiff"] = bool(value)
-
-        elif field.endswith("_a"):
-            column_name = field[: -len("_a")]
-            columns[column_name]["dataset1"] = value
-            columns[column_name]["isPK"] = column_name in key_columns
-
-        elif field.endswith("_b"):
-            column_name = field[: -len("_b")]
-            columns[column_name]["dataset2"] = value
-            columns[column_name]["isPK"] = column_name in key_columns
-
-    return {column: JsonDiffRowValue(**data) for column, data in columns.items()}
+def _jsonify_diff(row: Row, columns: Dict[str, Tuple[int, int, int, bool]]) -> Dict[str, JsonDiffRowValue]:
+    return {
+        column: JsonDiffRowValue(dataset1=row[i1], dataset2=row[i2], isDiff=bool(row[i_diff]), isPK=is_pk)
+        for column, (i1, i2, i_diff, is_pk) in columns.items()
+    }
 
 
-def _jsonify_exclusive(row: Dict[str, Any], key_columns: List[str]) -> Dict[str, JsonExclusiveRowValue]:
-    columns = collections.defaultdict(dict)
-    for field, value in row.items():
-        if field in ("is_exclusive_a", "is_exclusive_b"):
-            continue
-        if field.startswith("is_diff_"):
-            continue
-        if field.endswith("_b") and row["is_exclusive_b"]:
-            column_name = field[: -len("_b")]
-            columns[column_name]["isPK"] = column_name in key_columns
-            columns[column_name]["value"] = value
-        elif field.endswith("_a") and row["is_exclusive_a"]:
-            column_name = field[: -len("_a")]
-            columns[column_name]["isPK"] = column_name in key_columns
-            columns[column_name]["value"] = value
-    return {column: JsonExclusiveRowValue(**data) for column, data in columns.items()}
+def _jsonify_exclusive(row: Row, columns: Dict[str, Tuple[int, bool]]) -> Dict[str, JsonExclusiveRowValue]:
+    return {column: JsonExclusiveRowValue(isPK=is_pk, value=row[i]) for column, (i, is_pk) in columns.items()}
 
 
 def _jsonify_diff_summary(stats_dict: dict) -> JsonDiffSummary:
@@ -65,6 +65,21 @@ def match_regexps(regexps: Dict[str, Any], s: str) -> Sequence[tuple]:
             yield m, v
 
 
+def sql_leading_keyword(sql_code: str) -> str:
+    """Return the lowercased leading keyword of a SQL statement (e.g. 'select').
+
+    Only the keyword is lowercased, so that large generated queries aren't copied just to classify them.
+    """
+    n = len(sql_code)
+    start = 0
+    while start < n and sql_code[start].isspace():
+        start += 1
+    end = start
+    while end < n and sql_code[end].isalpha():
+        end += 1
+    return sql_code[start:end].lower()
+
+
 # -- Schema --
 
 V = TypeVar("V")
@@ -0,0 +1,245 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+from data_diff.abcs.database_types import Array, Decimal, Integer, Struct, Text, Timestamp, UnknownColType
+from data_diff.databases import athena as athena_differ, presto
+from data_diff.databases._connect import MatchUriPath
+from data_diff.schema import RawColumnInfo
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+
+def connect_athena(**kw) -> athena_differ.Athena:
+    "Create an Athena instance on a mocked PyAthena connection"
+    with patch.object(athena_differ, "import_athena", return_value=MagicMock()):
+        return athena_differ.Athena(
+            aws_profile_name="profile", s3_staging_dir="s3://bucket/", region_name="region", work_group="wg", **kw
+        )
+
+
+class TestAthenaConnect(unittest.TestCase):
+    def test_cursor_class(self):
+        with patch.object(athena_differ, "import_athena", return_value=MagicMock()) as import_athena:
+            athena_differ.Athena(aws_profile_name="profile", cursor_class=MagicMock)
+        self.assertIs(import_athena.return_value.connect.call_args.kwargs["cursor_class"], MagicMock)
+
+        # As given in a URI
+        with self.assertRaises(TypeError):
+            connect_athena(cursor_class="pyathena.pandas.cursor.PandasCursor")
+
+    def test_use_pandas_cursor(self):
+        with patch.object(athena_differ, "import_athena", return_value=MagicMock()) as import_athena, patch.object(
+            athena_differ, "import_athena_pandas_cursor", return_value=StubPandasCursor
+        ):
+            athena_differ.Athena(aws_profile_name="profile", use_pandas_cursor="true")
+        self.assertIs(import_athena.return_value.connect.call_args.kwargs["cursor_class"], StubPandasCursor)
+
+        # Without pandas installed, falls back to the default cursor
+        with patch.object(athena_differ, "import_athena", return_value=MagicMock()) as import_athena, patch.object(
+            athena_differ, "import_athena_pandas_cursor", side_effect=ModuleNotFoundError("No module named 'pandas'")
+        ), self.assertLogs("athena", level="WARNING"):
+            athena_differ.Athena(aws_profile_name="profile", use_pandas_cursor="true")
+        self.assertNotIn("cursor_class", import_athena.return_value.connect.call_args.kwargs)
+
+    def test_result_reuse_uri_params(self):
+        class Dsn:
+            paths = ["profile", "s3", "region", "wg"]
+            query = {"result_reuse_enable": "true", "result_reuse_minutes": "30"}
+
+        kw = MatchUriPath(athena_differ.Athena).match_path(Dsn())
+        self.assertEqual(kw["result_reuse_enable"], "true")
+        self.assertEqual(kw["result_reuse_minutes"], "30")
+
+        # Extra path segments are not read as options
+        Dsn.paths = ["profile", "s3", "region", "wg", "true", "60"]
+        Dsn.query = {}
+        with self.assertRaises(ValueError):
+            MatchUriPath(athena_differ.Athena).match_path(Dsn())
+
+        with patch.object(athena_differ, "import_athena", return_value=MagicMock()) as import_athena:
+            athena_differ.Athena(aws_profile_name="profile", result_reuse_enable="true", result_reuse_minutes="30")
+        connect_kw = import_athena.return_value.connect.call_args.kwargs
+        self.assertEqual((connect_kw["result_reuse_enable"], connect_kw["result_reuse_minutes"]), (True, 30))
+
+
+class TestAthenaTableSchemas(unittest.TestCase):
+    def setUp(self):
+        self.db = connect_athena()
+        patcher = patch.object(
+            athena_differ.Athena,
+            "_query",
+            return_value=[
+                ("sales", "orders", "id", "integer", 3, 3, None),
+                ("public", "users", "id", "bigint", 3, 3, None),
+                ("sales", "orders", "total", "decimal(10,2)", 3, 3, None),
+                ("public", "users", "name", "varchar", 3, 3, None),
+                # Matches the filters, but is neither of the requested tables
+                ("public", "orders", "id", "varchar", 3, 3, None),
+            ],
+        )
+        self.query = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_select_table_schema(self):
+        self.assertEqual(
+            self.db.select_table_schema(("users",)),
+            "SELECT column_name, data_type, 3 as datetime_precision, 3 as numeric_precision, NULL as numeric_scale "
+            "FROM INFORMATION_SCHEMA.COLUMNS WHERE table_name = 'users' AND table_schema = 'public'",
+        )
+
+        sql_code, params = self.db._select_table_schema_params(("sales", "o'rders"))
+        self.assertTrue(sql_code.endswith("WHERE table_name = %(table)s AND table_schema = %(schema)s"))
+        self.assertEqual(params, {"table": "o'rders", "schema": "sales"})
+
+    def test_query_table_schema(self):
+        self.query.return_value = [("id", "integer", 3, 3, None)]
+        self.assertEqual(list(self.db.query_table_schema(("sales", "orders"))), ["id"])
+        self.assertEqual(self.query.call_args.args[1], {"table": "orders", "schema": "sales"})
+
+    def test_select_table_schemas(self):
+        sql_code, params = self.db.select_table_schemas([("sales", "orders"), ("users",)])
+        self.assertTrue(
+            sql_code.endswith(
+                "WHERE table_schema IN (%(schema0)s, %(schema1)s) AND table_name IN (%(table0)s, %(table1)s)"
+            )
+        )
+        self.assertEqual(params, {"schema0": "sales", "table0": "orders", "schema1": "public", "table1": "users"})
+
+    def test_query_table_schemas(self):
+        orders, users = self.db.query_table_schemas([("sales", "orders"), ("users",)])
+        self.query.assert_called_once()
+        self.assertEqual(list(orders), ["id", "total"])
+        self.assertEqual(orders["total"].data_type, "decimal(10,2)")
+        self.assertEqual(orders["id"].data_type, "integer")
+        self.assertEqual(list(users), ["id", "name"])
+        self.assertEqual(users["id"].data_type, "bigint")
+
+        # Results follow the order of the given paths, not of the rows
+        users, orders = self.db.query_table_schemas([("users",), ("sales", "orders")])
+        self.assertEqual((list(users), list(orders)), (["id", "name"], ["id", "total"]))
+
+    def test_query_table_schemas_missing_table(self):
+        with self.assertRaises(RuntimeError):
+            self.db.query_table_schemas([("sales", "orders"), ("sales", "missing")])
+
+
+class TestAthenaDialect(unittest.TestCase):
+    def setUp(self):
+        self.dialect = athena_differ.Dialect()
+
+    def test_normalize_timestamp(self):
+        self.assertEqual(
+            self.dialect.normalize_timestamp("t", Timestamp(precision=3, rounds=True)),
+            "RPAD(RPAD(date_format(cast(t as timestamp(6)), '%Y-%m-%d %H:%i:%S.%f'), 23, '.'), 26, '0')",
+        )
+
+    def test_timestamp_value(self):
+        t = datetime(2020, 1, 1, 12, 0, 0, 123)
+        self.assertEqual(self.dialect.timestamp_value(t), "timestamp '2020-01-01 12:00:00.000123'")
+
+        # Equal instants in different offsets keep their own literal
+        utc = datetime(2020, 1, 1, 12, tzinfo=timezone.utc)
+        plus_one = datetime(2020, 1, 1, 13, tzinfo=timezone(timedelta(hours=1)))
+        self.assertEqual(self.dialect.timestamp_value(utc), "timestamp '2020-01-01 12:00:00+00:00'")
+        self.assertEqual(self.dialect.timestamp_value(plus_one), "timestamp '2020-01-01 13:00:00+01:00'")
+
+    def test_normalize_number(self):
+        self.assertEqual(
+            self.dialect.normalize_number("n", Decimal(precision=2)), "cast(cast(n as decimal(38,2)) as varchar)"
+        )
+
+    def test_to_string(self):
+        self.assertEqual(self.dialect.to_string("s"), "cast(s as varchar)")
+        self.assertEqual(self.dialect.md5_as_hex("s"), "to_hex(md5(to_utf8(s)))")
+        self.assertEqual(self.dialect.md5_as_int("s"), presto.Dialect().md5_as_int("s"))
+        self.assertEqual(self.dialect.normalize_boolean("b", None), "cast(cast (b as int) as varchar)")
+
+    def parse_type(self, data_type: str):
+        info = RawColumnInfo(column_name="c", data_type=data_type, datetime_precision=3, numeric_precision=3)
+        return self.dialect.parse_type(("schema", "table"), info)
+
+    def test_split_struct_fields(self):
+        split = athena_differ._split_struct_fields
+        self.assertEqual(list(split("a:integer")), ["a:integer"])
+        self.assertEqual(list(split("a:integer, b:varchar(3)")), ["a:integer", " b:varchar(3)"])
+        self.assertEqual(
+            list(split("a:decimal(10,2),b:struct<x:integer,y:array(bigint)>,c:array(struct<p:integer,q:string>)")),
+            ["a:decimal(10,2)", "b:struct<x:integer,y:array(bigint)>", "c:array(struct<p:integer,q:string>)"],
+        )
+
+    def test_parse_struct(self):
+        self.assertEqual(self.parse_type("struct<a:integer>"), Struct(fields=(("a", Integer()),)))
+        self.assertEqual(
+            self.parse_type("struct<a : integer,  b:decimal(10,2), c:struct<x:varchar(3),y:array(bigint)>>"),
+            Struct(
+                fields=(
+                    ("a", Integer()),
+                    ("b", Decimal(precision=2)),
+                    ("c", Struct(fields=(("x", Text()), ("y", Array(item_type=Integer()))))),
+                )
+            ),
+        )
+        self.assertEqual(self.parse_type("struct<integer,varchar(3)>"), UnknownColType("struct<integer,varchar(3)>"))
+
+
+class StubCursor:
+    "Cursor over fixed rows"
+
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.executed = []
+
+    def execute(self, sql_code, params=None):
+        self.executed.append((sql_code, params))
+
+    def fetchall(self):
+        return self.rows
+
+    def fetchone(self):
+        return None
+
+
+class StubPandasCursor(StubCursor):
+    "Cursor that returns its rows as a DataFrame, like PyAthena's PandasCursor"
+
+    def __init__(self, df=None):
+        super().__init__()
+        self.df = df
+
+    def as_pandas(self):
+        return self.df
+
+
+class TestAthenaQueryCursor(unittest.TestCase):
+    def test_select(self):
+        rows = [(1,), (2,), (3,)]
+        self.assertEqual(athena_differ.query_cursor(StubCursor(rows), "SELECT 1"), rows)
+        self.assertEqual(athena_differ.query_cursor(StubCursor(rows), "\n\tselect 1"), rows)
+
+    def test_other_statements(self):
+        c = StubCursor()
+        c.fetchone = MagicMock(return_value=None)
+        athena_differ.query_cursor(c, "INSERT INTO t VALUES (1)")
+        athena_differ.query_cursor(c, "  Drop table t")
+        self.assertEqual(c.fetchone.call_count, 2)
+
+        c.fetchone.reset_mock()
+        self.assertIsNone(athena_differ.query_cursor(c, "WITH a AS (SELECT 1) SELECT * FROM a"))
+        self.assertEqual(c.fetchone.call_count, 0)
+
+    @unittest.skipUnless(pd, "pandas not installed")
+    def test_select_pandas_cursor(self):
+        df = pd.DataFrame(
+            {
+                "id": pd.array([1, None, 3], dtype="Int64"),
+                "price": [1.5, float("nan"), 3.0],
+                "name": ["a", "b", None],
+            }
+        )
+        rows = athena_differ.query_cursor(StubPandasCursor(df), "SELECT id, price, name FROM t")
+        self.assertEqual(rows, [(1, 1.5, "a"), (None, None, "b"), (3, 3.0, None)])
+        self.assertIsInstance(rows[0], tuple)
@@ -40,3 +40,28 @@ class TestDuckDBTableSchemaMethods(unittest.TestCase):
         db_path = ("custom_db", "custom_schema", "test_table")
         expected_sql = "SELECT column_name, data_type, datetime_precision, numeric_precision, numeric_scale FROM custom_db.information_schema.columns WHERE table_name = 'test_table' AND table_schema = 'custom_schema' and table_catalog = 'custom_db'"
         self.assertEqual(self.duckdb_conn.select_table_schema(db_path), expected_sql)
+
+
+class TestDuckDBQueryCursor(unittest.TestCase):
+    def setUp(self):
+        self.duckdb_conn = duckdb_differ.DuckDB(filepath=test_duckdb_filepath)
+
+    def tearDown(self):
+        self.duckdb_conn.close()
+        os.remove(test_duckdb_filepath)
+
+    def test_row_returning_statements(self):
+        result = self.duckdb_conn._query("SELECT 1 AS x")
+        self.assertEqual((result.rows, result.columns), ([(1,)], ["x"]))
+
+        # Leading whitespace and case don't hide the keyword
+        result = self.duckdb_conn._query("\n\t  select 2 AS y")
+        self.assertEqual((result.rows, result.columns), ([(2,)], ["y"]))
+
+        self.assertIsNotNone(self.duckdb_conn._query("  EXPLAIN SELECT 1"))
+        self.assertIsNotNone(self.duckdb_conn._query("SHOW TABLES"))
+
+    def test_other_statements(self):
+        self.assertIsNone(self.duckdb_conn._query("\nCREATE TABLE t (x INTEGER)"))
+        self.assertIsNone(self.duckdb_conn._query("INSERT INTO t VALUES (1)"))
+        self.assertEqual(self.duckdb_conn._query("SELECT x FROM t").rows, [(1,)])
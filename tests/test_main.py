@@ -1,8 +1,16 @@
 import unittest
+from unittest.mock import MagicMock
 
 from data_diff import Database, JoinDiffer, HashDiffer
 from data_diff import databases as db
-from data_diff.__main__ import _get_dbs, _set_age, _get_table_differ, _get_expanded_columns, _get_threads
+from data_diff.__main__ import (
+    _get_dbs,
+    _set_age,
+    _get_table_differ,
+    _get_expanded_columns,
+    _get_threads,
+    _get_schemas,
+)
 from data_diff.databases.mysql import MySQL
 from data_diff.diff_tables import TableDiffer
 from tests.common import CONN_STRINGS, get_conn, DiffTestCase
@@ -170,6 +178,38 @@ class TestGetTableDiffer(unittest.TestCase):
         return _get_table_differ(algorithm, db1, db2, False, 1, False, False, False, 1, None, None, None)
 
 
+class TestGetSchemas(unittest.TestCase):
+    def setUp(self) -> None:
+        self.differ = MagicMock()
+        self.differ._thread_map.side_effect = map
+        self.table_paths = [("schema", "table1"), ("schema", "table2")]
+
+    def test__get_schemas_batched(self):
+        db1 = MagicMock(SUPPORTS_BATCHED_TABLE_SCHEMAS=True)
+        db1.query_table_schemas.return_value = [{"id": 1}, {"id": 2}]
+
+        schemas = _get_schemas((db1, db1), self.table_paths, self.differ)
+        self.assertEqual(schemas, [{"id": 1}, {"id": 2}])
+        db1.query_table_schemas.assert_called_once_with(self.table_paths)
+        db1.query_table_schema.assert_not_called()
+
+    def test__get_schemas_per_table(self):
+        # Different databases, even when both support batching
+        db1 = MagicMock(SUPPORTS_BATCHED_TABLE_SCHEMAS=True)
+        db2 = MagicMock(SUPPORTS_BATCHED_TABLE_SCHEMAS=True)
+        schemas = _get_schemas((db1, db2), self.table_paths, self.differ)
+        self.assertEqual(schemas, [db1.query_table_schema.return_value, db2.query_table_schema.return_value])
+        db1.query_table_schema.assert_called_once_with(("schema", "table1"))
+        db2.query_table_schema.assert_called_once_with(("schema", "table2"))
+        db1.query_table_schemas.assert_not_called()
+
+        # Same database, without batching
+        db1 = MagicMock(SUPPORTS_BATCHED_TABLE_SCHEMAS=False)
+        _get_schemas((db1, db1), self.table_paths, self.differ)
+        self.assertEqual(db1.query_table_schema.call_count, 2)
+        db1.query_table_schemas.assert_not_called()
+
+
 class TestGetExpandedColumns(DiffTestCase):
     db_cls = MySQL
 
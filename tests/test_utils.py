@@ -11,6 +11,7 @@ from data_diff.utils import (
     columns_removed_template,
     columns_added_template,
     columns_type_changed_template,
+    sql_leading_keyword,
 )
 
 from data_diff.__main__ import _remove_passwords_in_dict
@@ -136,6 +137,27 @@ class TestUtils(unittest.TestCase):
         assert number_to_human(-1000000) == "-1m"
         assert number_to_human(-1000000000) == "-1b"
 
+    def test_sql_leading_keyword(self):
+        # Test case insensitivity
+        self.assertEqual(sql_leading_keyword("select 1"), "select")
+        self.assertEqual(sql_leading_keyword("SELECT 1"), "select")
+        self.assertEqual(sql_leading_keyword("SeLeCt * FROM t"), "select")
+
+        # Test leading whitespace
+        self.assertEqual(sql_leading_keyword("\n\n  SELECT 1"), "select")
+        self.assertEqual(sql_leading_keyword("\t\tinsert into t values (1)"), "insert")
+
+        # Test the keyword ends at the first non-letter
+        self.assertEqual(sql_leading_keyword("SHOW TABLES"), "show")
+        self.assertEqual(sql_leading_keyword("EXPLAIN(select 1)"), "explain")
+        self.assertEqual(sql_leading_keyword("select*from t"), "select")
+
+        # Test statements that don't start with a keyword of interest
+        self.assertEqual(sql_leading_keyword(""), "")
+        self.assertEqual(sql_leading_keyword("   "), "")
+        self.assertEqual(sql_leading_keyword("(select 1)"), "")
+        self.assertEqual(sql_leading_keyword("WITH a AS (select 1) select * from a"), "with")
+
 
 class TestDiffIntDynamicColorTemplate(unittest.TestCase):
     def test_string_input(self):